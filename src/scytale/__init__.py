@@ -16,7 +16,7 @@ from . import tools
 from .cryptobox import CryptoBox
 from .tools.alphaencoder import CryptoNumber, modpow
 from .tools.alphabet import char2num, num2char, get_alphabet, get_alphabet_permutation
-from .tools.hashes import sha3hash
+from .tools.hashes import sha3hash, sha3hash_many
 from .tools.primes import random_prime
 from .tools.rng import MT19937
 
@@ -29,6 +29,7 @@ __all__ = [
     "get_alphabet",
     "get_alphabet_permutation",
     "sha3hash",
+    "sha3hash_many",
     "MT19937",
     "random_prime",
 ]
@@ -8,6 +8,9 @@
 Main cryptographic module
 """
 
+import numpy as np
+
+from .tools.alphabet import _ALEN
 from .tools.alphaencoder import encode_wrapped, decode_and_wrap
 
 
@@ -50,6 +53,16 @@ class CryptoBox(object):
 
     >>> cyph = cb.encrypt(msg, key)
     >>> msg = cb.decrypt(cyph, key)
+
+    Optionally, the call-backs may provide a `batch` attribute, processing the
+    whole encoded message at once as a NumPy array, in which case it is used
+    instead of calling the encoder/decoder on each number:
+
+    >>> def encode_batch(code, key):
+    >>>     ...
+    >>>     return cypher_code
+
+    >>> encoder.batch = encode_batch
     """
 
     def __init__(self, encoder, decoder, hexa=False, double_count=False):
@@ -62,6 +75,16 @@ class CryptoBox(object):
         if hasattr(encoder, "double_count"):
             self._double_count = encoder.double_count
 
+    def _word(self, n):
+        """Reduce a call-back result to the part that is read when decoding
+
+        :param n: Arbitrary precision integer
+        :return: 32-bit word (`hexa`) or position in the alphabet
+        """
+        if self._hexa:
+            return n & 2**32 - 1
+        return n % _ALEN
+
     def encrypt(self, msg, key=None):
         """Encrypt a message
 
@@ -70,13 +93,24 @@ class CryptoBox(object):
         :return: Encrypted message
         """
         code, wlen, plainchrs = encode_wrapped(msg, self._hexa)
-        cipher_code = []
-        for pos, n in enumerate(code):
+        batch = getattr(self._encoder, "batch", None)
+        if batch is not None:
+            cipher_code = batch(np.asarray(code, dtype=np.int64), key)
             if self._double_count:
+                m = np.asarray(cipher_code, dtype=np.uint64)
+                cipher_code = np.empty(2 * len(m), dtype=np.uint64)
+                cipher_code[0::2] = m & 2**32 - 1
+                cipher_code[1::2] = m >> 32
+        elif self._double_count:
+            cipher_code = np.empty(2 * len(code), dtype=np.int64)
+            for pos, n in enumerate(code.tolist()):
                 m = self._encoder(n, pos, key)
-                cipher_code.extend([m & 2**32 - 1, m >> 32])
-            else:
-                cipher_code.append(self._encoder(n, pos, key))
+                cipher_code[2 * pos] = self._word(m & 2**32 - 1)
+                cipher_code[2 * pos + 1] = self._word(m >> 32)
+        else:
+            cipher_code = np.empty(len(code), dtype=np.int64)
+            for pos, n in enumerate(code.tolist()):
+                cipher_code[pos] = self._word(self._encoder(n, pos, key))
         cipher_msg = decode_and_wrap(
             cipher_code, wlen, plainchrs, self._hexa, crop=False
         )
@@ -99,15 +133,25 @@ class CryptoBox(object):
         cipher_code, wlen, plainchrs = encode_wrapped(cipher_msg, self._hexa)
         if self._hexa:
             wlen.append(npad)
-        code = []
-        if self._double_count:
-            for pos, n in enumerate(cipher_code):
+        batch = getattr(self._decoder, "batch", None)
+        if batch is not None:
+            if self._double_count:
+                w = np.asarray(cipher_code, dtype=np.uint64)
+                half = len(w) // 2
+                code = batch(w[0 : 2 * half : 2] + (w[1 : 2 * half : 2] << 32), key)
+            else:
+                code = batch(np.asarray(cipher_code, dtype=np.int64), key)
+        elif self._double_count:
+            code = np.empty(len(cipher_code) // 2, dtype=np.int64)
+            for pos, n in enumerate(cipher_code.tolist()):
                 if pos % 2:
-                    code.append(self._decoder(m + (n << 32), pos // 2, key))
+                    m = self._decoder(m + (n << 32), pos // 2, key)
+                    code[pos // 2] = self._word(m)
                 else:
                     m = n
         else:
-            for pos, n in enumerate(cipher_code):
-                code.append(self._decoder(n, pos, key))
+            code = np.empty(len(cipher_code), dtype=np.int64)
+            for pos, n in enumerate(cipher_code.tolist()):
+                code[pos] = self._word(self._decoder(n, pos, key))
         msg = decode_and_wrap(code, wlen, plainchrs, self._hexa, crop=True)
         return msg
@@ -9,22 +9,93 @@ A generalization of the Caesar cipher, allowing for a variable shift
 depending on a given position and key
 """
 
+import numpy as np
+
+from ..tools.alphabet import _ALEN, char2num, get_alphabet
+from ..tools.alphaencoder import codepoints
 
-def _shift(pos, key):
-    from ..tools.alphabet import char2num
 
+def _shift(pos, key):
     return char2num(key[pos % len(key)])
 
 
-def encoder(n, pos, key):
-    from ..tools.alphabet import get_alphabet
+def _shifts(n, key):
+    shifts = np.array([char2num(k) for k in key], dtype=np.int64)
+    return np.take(shifts, np.arange(n) % len(key))
 
+
+def encoder(n, pos, key):
     shift = _shift(pos, key)
-    return (n + shift) % len(get_alphabet())
+    return (n + shift) % _ALEN
 
 
 def decoder(n, pos, key):
-    from ..tools.alphabet import get_alphabet
-
     shift = _shift(pos, key)
-    return (n - shift) % len(get_alphabet())
+    return (n - shift) % _ALEN
+
+
+def encode_batch(code, key):
+    """Batch version of `encoder`
+
+    :param code: Array with the whole encoded message
+    :param key: Key
+    :return: Array with the cyphered code
+    """
+    return (code + _shifts(len(code), key)) % _ALEN
+
+
+def decode_batch(code, key):
+    """Batch version of `decoder`
+
+    :param code: Array with the whole cyphered code
+    :param key: Key
+    :return: Array with the decyphered code
+    """
+    return (code - _shifts(len(code), key)) % _ALEN
+
+
+encoder.batch = encode_batch
+decoder.batch = decode_batch
+
+
+def _stream(msg, key, sign):
+    if not key:
+        raise ValueError("The key should not be empty!")
+
+    alphabet = get_alphabet().encode("latin-1")
+    cp, mask = codepoints(msg)
+    msg0 = cp[mask].astype(np.uint8).tobytes()
+    cipher_msg0 = bytearray(len(msg0))
+    for i, k in enumerate(key):
+        shift = sign * char2num(k) % _ALEN
+        table = bytes.maketrans(alphabet, alphabet[shift:] + alphabet[:shift])
+        cipher_msg0[i :: len(key)] = msg0[i :: len(key)].translate(table)
+    cp = cp.copy()
+    cp[mask] = np.frombuffer(cipher_msg0, dtype=np.uint8)
+    return cp.tobytes().decode("utf-32-le", "surrogatepass")
+
+
+def encrypt_stream(msg, key):
+    """Encrypt a message in a single pass
+
+    Same cypher as with a `CryptoBox(encoder, decoder)`, but each shift of
+    the key is applied through a translation table, without going through the
+    encoded message.
+
+    :param msg: Plain message
+    :param key: Key
+    :return: Encrypted message
+    """
+    return _stream(msg, key, 1)
+
+
+def decrypt_stream(cipher_msg, key):
+    """Decrypt a message in a single pass
+
+    Reciprocal function to `encrypt_stream`
+
+    :param cipher_msg: Encrypted message
+    :param key: Key
+    :return: Plain message
+    """
+    return _stream(cipher_msg, key, -1)
@@ -13,63 +13,106 @@ or a `CryptoNumber`, in which case the key is mapped to an arbitrary
 permutation of the alphabet.
 """
 
+import numpy as np
 
-def encoder(n, pos, key):
+
+def _permutation(coder, key):
+    """Get the permutation of a coder for a given key
+
+    The permutation and its inverse are built together the first time a key
+    is met, and stored into `encoder.permutations` and `decoder.permutations`
+    respectively, so that each key is processed only once.
+
+    :param coder: Either `encoder` or `decoder`
+    :param key: Key
+    :return: Permutation
+    """
     from ..tools.alphabet import char2num, get_alphabet_permutation
     from ..tools.alphaencoder import CryptoNumber
 
-    if isinstance(key, CryptoNumber):
-        is_cryptonumber = True
-    else:
-        is_cryptonumber = False
+    cache_key = tuple(key) if isinstance(key, CryptoNumber) else key
     try:
-        if is_cryptonumber:
-            permutation = encoder.permutations[tuple(key)]
-        else:
-            permutation = encoder.permutations[key]
+        return coder.permutations[cache_key]
     except KeyError:
-        if is_cryptonumber:
+        if isinstance(key, CryptoNumber):
             new_alphabet = get_alphabet_permutation(str(key))
-            key = tuple(key)
         elif key is None:
             new_alphabet = get_alphabet_permutation()
         else:
             new_alphabet = key
         permutation = [char2num(c) for c in new_alphabet]
-        encoder.permutations[key] = permutation
-    return permutation[n]
+        inv_permutation = len(new_alphabet) * [0]
+        for i, n in enumerate(permutation):
+            inv_permutation[n] = i
+        encoder.permutations[cache_key] = permutation
+        decoder.permutations[cache_key] = inv_permutation
+    return coder.permutations[cache_key]
+
+
+def encoder(n, pos, key):
+    return _permutation(encoder, key)[n]
+
+
+def encode_batch(code, key):
+    """Batch version of `encoder`
+
+    :param code: Array with the whole encoded message
+    :param key: Key
+    :return: Array with the cyphered code
+    """
+    return np.take(_permutation(encoder, key), code)
 
 
 encoder.permutations = {}
+encoder.batch = encode_batch
 
 
 def decoder(n, pos, key):
-    from ..tools.alphabet import char2num, get_alphabet_permutation
-    from ..tools.alphaencoder import CryptoNumber
+    return _permutation(decoder, key)[n]
 
-    if isinstance(key, CryptoNumber):
-        is_cryptonumber = True
-    else:
-        is_cryptonumber = False
-    try:
-        if is_cryptonumber:
-            permutation = decoder.permutations[tuple(key)]
-        else:
-            permutation = decoder.permutations[key]
-    except KeyError:
-        if is_cryptonumber:
-            new_alphabet = get_alphabet_permutation(str(key))
-            key = tuple(key)
-        elif key is None:
-            new_alphabet = get_alphabet_permutation()
-        else:
-            new_alphabet = key
-        inv_permutation = [char2num(c) for c in new_alphabet]
-        permutation = len(new_alphabet) * [0]
-        for i in inv_permutation:
-            permutation[inv_permutation[i]] = i
-        decoder.permutations[key] = permutation
-    return permutation[n]
+
+def decode_batch(code, key):
+    """Batch version of `decoder`
+
+    :param code: Array with the whole cyphered code
+    :param key: Key
+    :return: Array with the decyphered code
+    """
+    return np.take(_permutation(decoder, key), code)
 
 
 decoder.permutations = {}
+decoder.batch = decode_batch
+
+
+def _stream(msg, coder, key):
+    from ..tools.alphabet import get_alphabet, num2char
+
+    permuted = "".join(num2char(n) for n in _permutation(coder, key))
+    return msg.translate(str.maketrans(get_alphabet(), permuted))
+
+
+def encrypt_stream(msg, key):
+    """Encrypt a message in a single pass
+
+    Same cypher as with a `CryptoBox(encoder, decoder)`, but the permutation
+    is applied through a translation table, without going through the encoded
+    message.
+
+    :param msg: Plain message
+    :param key: Key
+    :return: Encrypted message
+    """
+    return _stream(msg, encoder, key)
+
+
+def decrypt_stream(cipher_msg, key):
+    """Decrypt a message in a single pass
+
+    Reciprocal function to `encrypt_stream`
+
+    :param cipher_msg: Encrypted message
+    :param key: Key
+    :return: Plain message
+    """
+    return _stream(cipher_msg, decoder, key)
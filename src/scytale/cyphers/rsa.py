@@ -8,42 +8,125 @@
 Implementation of the well-known RSA cipher mechanism
 """
 
+from collections import namedtuple
+from functools import lru_cache
 
 from ..tools.rng import MT19937
 
+try:
+    from gmpy2 import mpz, powmod
+except ImportError:
+    mpz = int
+    powmod = pow
+
 
 _rng = MT19937()
 
 
 def genRSAkeys(rng=_rng):
+    """Generate a pair of RSA keys
+
+    Without `gmpy2`, the private key also stores the factors of the modulus
+    together with the precomputed Chinese Remainder Theorem (CRT) components,
+    allowing for faster decryption with the builtin `pow`. GMP handles these
+    small moduli in a single limb, where CRT does not pay off.
+
+    :param rng: Random number generator
+    :return: Public and private keys
+    """
     from numpy import lcm
     from ..tools.alphaencoder import CryptoNumber
     from ..tools.primes import coprime, primeList
 
-    p = rng.choice(primeList.smalls)
-    q = rng.choice(primeList.bigs)
+    p = int(rng.choice(primeList.smalls))
+    q = int(rng.choice(primeList.bigs))
     n = p * q
     l = int(lcm(p - 1, q - 1))
     e = coprime(l)
     d = pow(e, -1, l)
+    private = [d & 2**32 - 1, d >> 32, n & 2**32 - 1, n >> 32]
+    if powmod is pow:
+        private += [p, q, d % (p - 1), d % (q - 1), pow(q, -1, p)]
     return str(
         CryptoNumber([e & 2**32 - 1, e >> 32, n & 2**32 - 1, n >> 32], fill=0)
-    ), str(CryptoNumber([d & 2**32 - 1, d >> 32, n & 2**32 - 1, n >> 32], fill=0))
+    ), str(CryptoNumber(private, fill=0))
 
 
-def RSA_coder(m, pos, key):
+KeyContext = namedtuple(
+    "KeyContext",
+    ["b", "n", "p", "q", "dp", "dq", "qinv"],
+    defaults=[None, None, None, None, None],
+)
+
+
+def key_context(key):
+    """Parse an RSA key
+
+    The parsed exponent and modulus are cached (as GMP integers when `gmpy2`
+    is available), so that a key is decoded only once per message. For
+    private keys, the CRT components are parsed as well when decryption goes
+    through the builtin `pow`.
+
+    :param key: Key
+    :return: `KeyContext` with the exponent, the modulus and, if available,
+             the CRT components
+    """
+    from ..tools.alphaencoder import CryptoNumber
+
+    if isinstance(key, CryptoNumber):
+        key = tuple(key)
+    return _key_context(key)
+
+
+@lru_cache(maxsize=256)
+def _key_context(key):
     from ..tools.alphaencoder import CryptoNumber
 
-    b0, b1, n0, n1, _, _ = CryptoNumber(key)
-    b = int(b0 + (b1 << 32))
-    n = int(n0 + (n1 << 32))
-    return pow(m, b, n)
+    b0, b1, n0, n1, *crt = CryptoNumber(key)
+    b = mpz(int(b0 + (b1 << 32)))
+    n = mpz(int(n0 + (n1 << 32)))
+    if powmod is pow and len(crt) == 5:
+        return KeyContext(b, n, *(mpz(int(c)) for c in crt))
+    return KeyContext(b, n)
+
+
+def RSA_coder(m, pos, key):
+    ctx = key_context(key)
+    if ctx.p is None:
+        return int(powmod(int(m), ctx.b, ctx.n))
+    m1 = powmod(int(m), ctx.dp, ctx.p)
+    m2 = powmod(int(m), ctx.dq, ctx.q)
+    h = ctx.qinv * (m1 - m2) % ctx.p
+    return int(m2 + h * ctx.q)
+
+
+def RSA_batch(code, key):
+    """Batch version of `RSA_coder`
+
+    Long messages are offloaded to the GPU when CuPy is available.
+
+    :param code: Array with the whole encoded message
+    :param key: Key
+    :return: Array with the cyphered code
+    """
+    from numpy import fromiter, uint64
+    from . import rsa_cuda
+
+    ctx = key_context(key)
+    if rsa_cuda.cupy is not None and len(code) > rsa_cuda.THRESHOLD:
+        return rsa_cuda.rsa_batch_gpu(code, int(ctx.b), int(ctx.n))
+    return fromiter(
+        (RSA_coder(m, pos, key) for pos, m in enumerate(code)),
+        dtype=uint64,
+        count=len(code),
+    )
 
 
 RSA_coder.hexa = True
 RSA_coder.double_count = True
+RSA_coder.batch = RSA_batch
 
 encoder = RSA_coder
 decoder = RSA_coder
 
-del MT19937, _rng
+del MT19937, _rng, namedtuple, lru_cache
@@ -0,0 +1,112 @@
+#!/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2024 Flavio Calvo (UNIL / DCSR)
+# All rights reserved.
+
+"""
+GPU offload of the RSA modular exponentiation
+
+Each number of a message is encrypted independently, so that long messages
+can be processed with one CUDA thread per number. This requires CuPy, and
+`cupy` is set to `None` when it is not available.
+"""
+
+try:
+    import cupy
+except ImportError:
+    cupy = None
+
+
+# Minimal number of words for the transfer to the device to pay off
+THRESHOLD = 10000
+
+_source = r"""
+extern "C" {
+
+/* Montgomery product a*b/2^64 mod n, for a, b < n and n odd */
+__device__ unsigned long long mont_mul(
+    unsigned long long a, unsigned long long b,
+    unsigned long long n, unsigned long long ninv)
+{
+    unsigned long long lo = a * b;
+    unsigned long long hi = __umul64hi(a, b);
+    unsigned long long m = lo * ninv;
+    unsigned long long mlo = m * n;
+    unsigned long long mhi = __umul64hi(m, n);
+    unsigned long long carry = (lo + mlo) < lo;
+    unsigned long long t = hi + mhi;
+    bool overflow = t < hi;
+    unsigned long long r = t + carry;
+    overflow |= r < t;
+    if (overflow || r >= n)
+        r -= n;
+    return r;
+}
+
+__global__ void rsa_powmod(
+    const unsigned long long *code, unsigned long long *out, long long count,
+    unsigned long long b, unsigned long long n, unsigned long long ninv,
+    unsigned long long r1, unsigned long long r2)
+{
+    long long i = (long long)blockDim.x * blockIdx.x + threadIdx.x;
+    if (i >= count)
+        return;
+    /* Montgomery ladder, with x0 = 1 and x1 = code[i] in Montgomery form */
+    unsigned long long x0 = r1;
+    unsigned long long x1 = mont_mul(code[i] % n, r2, n, ninv);
+    for (int k = 63 - __clzll((long long)b); k >= 0; k--) {
+        if ((b >> k) & 1) {
+            x0 = mont_mul(x0, x1, n, ninv);
+            x1 = mont_mul(x1, x1, n, ninv);
+        } else {
+            x1 = mont_mul(x0, x1, n, ninv);
+            x0 = mont_mul(x0, x0, n, ninv);
+        }
+    }
+    out[i] = mont_mul(x0, 1, n, ninv);
+}
+
+}
+"""
+
+_rsa_powmod = None if cupy is None else cupy.RawKernel(_source, "rsa_powmod")
+
+
+def rsa_batch_gpu(code, b, n, threads=256):
+    """Batch modular exponentiation on the GPU
+
+    Computes `pow(m, b, n)` for each number `m` of `code`, with 64-bit
+    Montgomery arithmetic.
+
+    :param code: Array of numbers
+    :param b: Exponent (at most 64 bits)
+    :param n: Odd modulus (at most 64 bits)
+    :param threads: Number of threads per CUDA block
+    :return: NumPy array with the results
+    """
+    if cupy is None:
+        raise RuntimeError("CuPy is required for GPU computations")
+    if n % 2 == 0:
+        raise ValueError("Montgomery arithmetic requires an odd modulus")
+    ninv = -pow(n, -1, 2**64) % 2**64
+    d_code = cupy.asarray(code, dtype=cupy.uint64)
+    d_out = cupy.empty_like(d_code)
+    if len(d_code) == 0:
+        return cupy.asnumpy(d_out)
+    blocks = (len(d_code) + threads - 1) // threads
+    _rsa_powmod(
+        (blocks,),
+        (threads,),
+        (
+            d_code,
+            d_out,
+            cupy.int64(len(d_code)),
+            cupy.uint64(b),
+            cupy.uint64(n),
+            cupy.uint64(ninv),
+            cupy.uint64(2**64 % n),
+            cupy.uint64(2**128 % n),
+        ),
+    )
+    return cupy.asnumpy(d_out)
@@ -10,6 +10,10 @@ All tools related to the alphabet
 """
 
 
+from functools import lru_cache
+
+import numpy as np
+
 from .rng import MT19937
 
 
@@ -19,6 +23,12 @@ _alphabet = (
     + "".join(chr(i) for i in range(ord("a"), 1 + ord("z")))
     + "+-%&/()!#@£"
 )
+_ALEN = len(_alphabet)
+_char2num = {c: i for i, c in enumerate(_alphabet)}
+_char2num_table = bytes(_char2num.get(chr(i), 255) for i in range(256))
+_num2char_table = np.frombuffer(_alphabet.encode("latin-1"), dtype=np.uint8)
+_alphabet_mask = np.zeros(256, dtype=bool)
+_alphabet_mask[[ord(c) for c in _alphabet]] = True
 
 
 def _permuted_alphabet():
@@ -27,6 +37,9 @@ def _permuted_alphabet():
 
 
 _permuted_alphabet = _permuted_alphabet()
+_permuted_alphabet_code = np.array(
+    [_char2num[c] for c in _permuted_alphabet], dtype=np.int64
+)
 
 
 def get_alphabet():
@@ -43,15 +56,26 @@ def char2num(c):
     :param c: Letter
     :return: Corresponding number
     """
-    return _alphabet.find(c)
+    return _char2num.get(c, -1)
+
+
+def char2num_bytes(s):
+    """Converts a latin-1 encoded string into numbers
+
+    Characters that do not belong to the alphabet are mapped to 255.
+
+    :param s: Latin-1 encoded bytes
+    :return: Array with the corresponding numbers
+    """
+    return np.frombuffer(s.translate(_char2num_table), dtype=np.uint8)
 
 
 def num2char(n):
     """Converts a number into a letter from the alphabet"""
-    return _alphabet[n % len(get_alphabet())]
+    return _alphabet[n % _ALEN]
 
 
-def code_divide(code, n, base=len(get_alphabet())):
+def code_divide(code, n, base=_ALEN):
     """Generalized inplace division for generic base system numbers
 
     Given a dividend encoded into a list of integers (a *code*),
@@ -71,32 +95,75 @@ def code_divide(code, n, base=len(get_alphabet())):
     return r
 
 
+_code_divide = code_divide
+
+
+def _build_permutation(key_code, alphalen):
+    # Digits of the key code in the factorial number system (Lehmer code)
+    lehmer = np.zeros(alphalen, dtype=np.int64)
+    for i in range(2, 1 + alphalen):
+        lehmer[alphalen - i] = _code_divide(key_code, i, alphalen)
+    # Each digit selects a letter among the ones not taken yet
+    available = np.ones(alphalen, dtype=np.bool_)
+    permutation = np.empty(alphalen, dtype=np.int64)
+    for j in range(alphalen):
+        k = lehmer[j]
+        for n in range(alphalen):
+            if available[n]:
+                if k == 0:
+                    break
+                k -= 1
+        available[n] = False
+        permutation[j] = n
+    return permutation
+
+
+@lru_cache(maxsize=None)
+def _jit():
+    """Compile `_build_permutation` with Numba, when available
+
+    Numba is imported at the first uncached permutation only, so that it does
+    not weigh on `import scytale`. The compiled division works on the int64
+    key code of `_alphabet_permutation`, while the public `code_divide` stays
+    in pure Python and keeps arbitrary precision.
+
+    :return: True if Numba is available
+    """
+    global _code_divide, _build_permutation
+    try:
+        from numba import njit
+    except ImportError:
+        return False
+    _code_divide = njit(cache=True)(code_divide)
+    _build_permutation = njit(cache=True)(_build_permutation)
+    return True
+
+
 def get_alphabet_permutation(key=None):
     """Map from key to alphabet permutation
 
     This map is surjective, but not injective: it is not a one-to-one map.
+    Results are memoized, hence lists of characters are converted to tuples.
 
     :param key: Key
     :return: New alphabet
     """
+    if isinstance(key, list):
+        key = tuple(key)
+    return _alphabet_permutation(key)
+
+
+@lru_cache(maxsize=256)
+def _alphabet_permutation(key):
     if key is None:
         return _permuted_alphabet
-    alphalen = len(get_alphabet())
-    step = max(1, alphalen // len(key))
+    step = max(1, _ALEN // len(key))
     coded_key = [char2num(c) for c in key]
-    key_code = [char2num(c) for c in _permuted_alphabet]
+    key_code = _permuted_alphabet_code.copy()
+    if not _jit():
+        key_code = key_code.tolist()
     for i, n in enumerate(coded_key):
-        pos = i * step % alphalen
-        key_code[pos] = (key_code[pos] + n) % alphalen
-    i = 2
-    permutation = []
-    for i in range(2, 1 + len(get_alphabet())):
-        permutation.append(code_divide(key_code, i))
-    permutation.reverse()
-    permuted_alphabet_code = []
-    alphabet = [char2num(c) for c in get_alphabet()]
-    for i in permutation:
-        permuted_alphabet_code.append(alphabet.pop(i))
-    permuted_alphabet_code.append(alphabet.pop(0))
-
-    return "".join([num2char(n) for n in permuted_alphabet_code])
+        pos = i * step % _ALEN
+        key_code[pos] = (key_code[pos] + n) % _ALEN
+    permutation = _build_permutation(key_code, _ALEN)
+    return _num2char_table[permutation].tobytes().decode("latin-1")
@@ -10,11 +10,32 @@ Tools for converting messages into numbers (back and forth)
 
 from collections.abc import Iterable
 
-from numpy import integer as npinteger
-from numpy import ndarray
-from numpy import vectorize
+import numpy as np
 
-from ..tools.alphabet import char2num, num2char, get_alphabet
+try:
+    from gmpy2 import powmod
+except ImportError:
+    powmod = pow
+
+from ..tools.alphabet import (
+    _ALEN,
+    _alphabet_mask,
+    _num2char_table,
+    char2num_bytes,
+    get_alphabet,
+)
+
+
+def codepoints(msg):
+    """Code points of a message, and their membership to the alphabet
+
+    :param msg: String
+    :return: Pair with the array of code points and the boolean mask of
+             the characters belonging to the alphabet
+    """
+    cp = np.frombuffer(msg.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+    mask = _alphabet_mask[np.minimum(cp, 255)] & (cp < 256)
+    return cp, mask
 
 
 def unwrap(msg):
@@ -28,19 +49,11 @@ def unwrap(msg):
     :return: Triplet with new string, lengths of the components, and
              characters splitting the components
     """
-    wlen = []
-    plainchrs = ""
-    msg0 = ""
-    count = 0
-    for c in msg:
-        if c in get_alphabet():
-            count += 1
-            msg0 += c
-        else:
-            wlen.append(count)
-            count = 0
-            plainchrs += c
-    wlen.append(count)
+    cp, mask = codepoints(msg)
+    plain = np.flatnonzero(~mask)
+    wlen = (np.diff(plain, prepend=-1, append=len(cp)) - 1).tolist()
+    plainchrs = cp[~mask].tobytes().decode("utf-32-le", "surrogatepass")
+    msg0 = cp[mask].astype(np.uint8).tobytes().decode("latin-1")
     msg0 += (16 - len(msg0) % 16) % 16 * "="
     return msg0, wlen, plainchrs
 
@@ -56,17 +69,23 @@ def wrap(msg0, wlen, plainchrs, crop=False):
     :param plainchrs: Component-splitting non-alphabetical characters
     :param crop: Whether to crop the possible extra-characters
     """
-    msg = ""
+    msg = []
     head = 0
     for l, c in zip(wlen[:-1], plainchrs):
-        msg += msg0[head : head + l]
-        msg += c
+        msg.append(msg0[head : head + l])
+        msg.append(c)
         head += l
     if crop:
-        msg += msg0[head : head + wlen[-1]]
+        msg.append(msg0[head : head + wlen[-1]])
     else:
-        msg += msg0[head:]
-    return msg
+        msg.append(msg0[head:])
+    return "".join(msg)
+
+
+def _char2num_array(msg0):
+    code = char2num_bytes(msg0.encode("latin-1", "replace")).astype(np.int64)
+    code[code == 255] = -1
+    return code
 
 
 def encode_unwrapped(msg0, hexa=False):
@@ -81,25 +100,25 @@ def encode_unwrapped(msg0, hexa=False):
 
     Note: the 3 numbers in the hex-encoding are still represented by
           64-bit integers, in order to (temporarily) allow for overflows.
+
+    :param msg0: Alphabetical string
+    :param hexa: Type of coding
+    :return: Array with the encoded message
     """
-    code = []
     if hexa:
-        n = 0
-        j = 0
-        for i in range(len(msg0) // 16):
-            word = msg0[i * 16 : (i + 1) * 16]
-            for c in word:
-                p = char2num(c)
-                for k in range(3):
-                    n += (p >> 2 * k & 3) * 4**j
-                    j += 1
-                    if j >= 16:
-                        code.append(n)
-                        n = 0
-                        j = 0
+        nblocks = len(msg0) // 16
+        nums = _char2num_array(msg0[: 16 * nblocks]).reshape(nblocks, 16)
+        # Concatenate the 6 bits of each letter into a 96-bit field, held
+        # in two 64-bit lanes, and cut it into 3 words of 32 bits
+        fields = (nums & 0x3F).astype(np.uint64)
+        lo = (fields[:, :11] << 6 * np.arange(11, dtype=np.uint64)).sum(axis=1)
+        hi = (fields[:, 10] >> 4) + (
+            fields[:, 11:] << 6 * np.arange(11, 16, dtype=np.uint64) - 64
+        ).sum(axis=1)
+        code = np.stack([lo & 2**32 - 1, lo >> 32, hi], axis=1)
+        code = code.astype(np.int64).reshape(-1)
     else:
-        for c in msg0:
-            code.append(char2num(c))
+        code = _char2num_array(msg0)
     return code
 
 
@@ -112,22 +131,22 @@ def decode_to_unwrapped(code, hexa=False):
     :param hexa: Type of coding (see `encode_unwrapped`)
     :return: Original message
     """
-    msg0 = ""
     if hexa:
-        n = 0
-        j = 0
-        for c in code:
-            for k in range(16):
-                n += (c >> 2 * k & 3) * 4**j
-                j += 1
-                if j >= 3:
-                    msg0 += num2char(n)
-                    n = 0
-                    j = 0
+        code = np.asarray(code)
+        if code.dtype.kind == "f":
+            raise TypeError("Floating-point codes should be fixed before decoding!")
+        if code.dtype == object:
+            code = [c & 2**32 - 1 for c in code]
+        words = np.asarray(code).astype(np.uint64)
+        digits = (words[:, None] >> 2 * np.arange(16, dtype=np.uint64) & 3).ravel()
+        digits = digits[: len(digits) // 3 * 3].reshape(-1, 3)
+        nums = digits[:, 0] + (digits[:, 1] << 2) + (digits[:, 2] << 4)
     else:
-        for n in code:
-            msg0 += num2char(n)
-    return msg0
+        code = np.asarray(code)
+        if code.dtype == object:
+            code = np.array([c % _ALEN for c in code])
+        nums = code.astype(np.int64)
+    return _num2char_table[nums % _ALEN].tobytes().decode("latin-1")
 
 
 def encode_wrapped(msg, hexa=False):
@@ -165,7 +184,7 @@ def decode_and_wrap(code, wlen, plainchrs, hexa=False, crop=False):
     return msg
 
 
-class CryptoNumber(ndarray):
+class CryptoNumber(np.ndarray):
     """CryptoNumber class
 
     A number represented with this class has a one-to-one corresponding string
@@ -214,58 +233,24 @@ class CryptoNumber(ndarray):
     B====L====f=====F=====H====F====B
     """
 
-    def __new__(subtype, *l, fill=None):
+    def __new__(cls, *l, fill=None):
         if len(l) == 1:
             if isinstance(l[0], str):
-                code, _, _ = encode_wrapped(l[0], True)
-                obj = super().__new__(
-                    subtype,
-                    shape=(len(code),),
-                    dtype=int,
-                    buffer=None,
-                    offset=0,
-                    strides=None,
-                    order=None,
-                )
-                return obj
+                return cls._make(encode_wrapped(l[0], True)[0])
             elif isinstance(l[0], Iterable):
                 l = l[0]
-        try:
-            assert len(l) % 3 == 0 or not fill is None
-        except AssertionError:
+        if len(l) % 3 and fill is None:
             raise ValueError("Crypto numbers should come in triplets of integers!")
-        try:
-            for e in l:
-                assert isinstance(e, (int, npinteger))
-        except AssertionError:
+        code = np.asarray(l)
+        if code.ndim != 1 or (code.size and code.dtype.kind not in "biu"):
             raise ValueError("Crypto numbers should be triplets of integers!")
-        if not fill is None and len(l) % 3:
-            llen = len(l) + 3 - len(l) % 3
-        else:
-            llen = len(l)
-        obj = super().__new__(
-            subtype,
-            shape=(llen,),
-            dtype=int,
-            buffer=None,
-            offset=0,
-            strides=None,
-            order=None,
-        )
-        return obj
-
-    def __init__(self, *l, fill=None):
-        super().__init__()
-        if len(l) == 1:
-            if isinstance(l[0], str):
-                l, _, _ = encode_wrapped(l[0], True)
-            elif isinstance(l[0], Iterable):
-                l = l[0]
-        if not fill is None and len(l) % 3:
-            l = list(l)
-            l.extend((3 - len(l) % 3) * [fill])
-        for i, e in enumerate(l):
-            self[i] = e
+        if len(code) % 3:
+            code = np.concatenate([code, (3 - len(code) % 3) * [fill]])
+        return cls._make(code)
+
+    @classmethod
+    def _make(cls, code):
+        return np.array(code, dtype=int).view(cls)
 
     def __array_finalize__(self, obj):
         if obj is None:
@@ -290,6 +275,25 @@ class CryptoNumber(ndarray):
         return self.round().astype(int)
 
 
-@vectorize
 def modpow(base, exp, mod=None):
-    return pow(int(base), int(exp), mod if mod is None else int(mod))
+    """Modular exponentiation
+
+    Computes `pow(base, exp, mod)` with arbitrary precision integers,
+    element-wise when the arguments are arrays (with NumPy broadcasting).
+
+    :param base: Base
+    :param exp: Exponent
+    :param mod: Modulus
+    :return: Integer, or object array of integers
+    """
+    if mod is None:
+        it = np.broadcast(base, exp)
+        results = [pow(int(b), int(e)) for b, e in it]
+    else:
+        it = np.broadcast(base, exp, mod)
+        results = [int(powmod(int(b), int(e), int(m))) for b, e, m in it]
+    if it.ndim == 0:
+        return results[0]
+    out = np.empty(len(results), dtype=object)
+    out[:] = results
+    return out.reshape(it.shape)
@@ -10,7 +10,7 @@ Hash functions
 
 import hashlib
 
-from numpy import array
+from numpy import frombuffer
 
 from .alphaencoder import CryptoNumber
 
@@ -18,19 +18,25 @@ from .alphaencoder import CryptoNumber
 def sha3hash(msg):
     """Hash a message
 
-    Uses the SHA3-256 algorithm in order to create a hash that is then
-    converted into a CryptoNumber
+    Uses the SHA3-256 algorithm (from OpenSSL, when `hashlib` is built
+    against it) in order to create a hash that is then converted into a
+    CryptoNumber
 
     :param msg: Message
     :return: Hash
     """
     s = hashlib.sha3_256(bytes(msg, "utf8")).digest()
-    return str(
-        CryptoNumber(
-            array([i for i in s[0::4]])
-            + (array([i for i in s[1::4]]) << 8)
-            + (array([i for i in s[2::4]]) << 16)
-            + (array([i for i in s[3::4]]) << 24),
-            fill=0,
-        )
-    )
+    return str(CryptoNumber(frombuffer(s, dtype="<u4").tolist(), fill=0))
+
+
+def sha3hash_many(msgs):
+    """Hash several messages
+
+    Same as `sha3hash`, but all digests are converted into words at once
+
+    :param msgs: Messages
+    :return: List of hashes
+    """
+    digests = b"".join(hashlib.sha3_256(bytes(m, "utf8")).digest() for m in msgs)
+    words = frombuffer(digests, dtype="<u4").reshape(-1, 8)
+    return [str(CryptoNumber(w, fill=0)) for w in words.tolist()]
@@ -8,11 +8,11 @@
 Tools for operating with prime numbers
 """
 
+from functools import lru_cache
 from itertools import compress, count
+from math import gcd
 
 import numpy as np
-from scipy.optimize import fsolve
-from scipy.special import expi
 
 from .rng import MT19937
 
@@ -24,12 +24,31 @@ _rng = MT19937()
 def isprime(n):
     """Checks if a number is prime
 
+    Integers up to `maxN` are looked up in a precomputed sieve.
+
     :param n: Number
     :return: True/False
     """
+    if isinstance(n, (int, np.integer)) and 0 <= n <= maxN:
+        return bool(_is_prime[int(n)])
     return n > 1 and all(n % i for i in range(2, int(n**0.5) + 1))
 
 
+def sieve(n):
+    """Sieve of Eratosthenes
+
+    :param n: Largest number to sieve
+    :return: Boolean array telling which numbers in range(n + 1) are prime
+    """
+    is_prime = np.ones(n + 1, dtype=bool)
+    is_prime[:2] = False
+    for i in range(2, int(n**0.5) + 1):
+        if is_prime[i]:
+            is_prime[i * i :: i] = False
+    return is_prime
+
+
+@lru_cache(maxsize=256)
 def coprime(l):
     """Find a coprime
 
@@ -39,12 +58,13 @@ def coprime(l):
     :param l: Number
     :return: Coprime
     """
-    for i in range(int(np.log(l - 1) / np.log(2)), 2, -1):
-        e = 2**i + 1
-        if np.gcd(e, l) == 1:
+    l = int(l)
+    for i in range((l - 1).bit_length() - 1, 2, -1):
+        e = (1 << i) + 1
+        if gcd(e, l) == 1:
             return e
     for e in range(l - 1, 1, -1):
-        if np.gcd(e, l) == 1:
+        if gcd(e, l) == 1:
             return e
     raise RuntimeError("No coprime found")
 
@@ -59,16 +79,13 @@ def primeList(rg):
     return list(compress(rg, sieve))
 
 
-primeList.all = np.array(primeList(range(2, 1 + maxN)))
+_is_prime = sieve(maxN)
+primeList.all = np.flatnonzero(_is_prime)
 nprimes = len(primeList.all)
-pmid = int(
-    fsolve(
-        lambda x: expi(np.log(nprimes))
-        - 2 * expi(np.log(x))
-        + expi(np.log(2**32 / (nprimes * np.log(nprimes)))),
-        nprimes,
-    ).item()
-)
+# Root (computed offline with scipy.optimize.fsolve, for maxN = 2**20) of
+#   Ei(log(nprimes)) - 2 Ei(log(x)) + Ei(log(2**32 / (nprimes log(nprimes))))
+assert maxN == 2**20
+pmid = 41218
 pmax = int((pmid / 3 + 2 * len(primeList.all)) / 3)
 pmin = int(np.min(np.argwhere(primeList.all > 2**32 / primeList.all[pmax])))
 primeList.bigs = primeList.all[pmax:]
@@ -0,0 +1,25 @@
+#!/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2024 Flavio Calvo (UNIL / DCSR)
+# All rights reserved.
+
+"""
+Regression tests for the message encoding tools
+"""
+
+import pytest
+
+from scytale import CryptoNumber
+from scytale.tools.alphaencoder import decode_to_unwrapped
+
+
+def test_decode_large_integers():
+    assert decode_to_unwrapped([8 + 2**64, 5, 2**63 + 3, -1]) == "HEC£"
+
+
+def test_float_cryptonumber_has_no_string():
+    half_cn = CryptoNumber([5, 6, 4]) / 2
+    with pytest.raises(TypeError):
+        str(half_cn)
+    assert str(half_cn.fix()) == "B====L====f"
@@ -0,0 +1,33 @@
+#!/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2024 Flavio Calvo (UNIL / DCSR)
+# All rights reserved.
+
+"""
+Regression tests for the Caesar cipher
+"""
+
+import pytest
+
+from scytale import CryptoBox
+from scytale.cyphers import caesar
+
+# Alphabet letters mixed with "£", non latin-1 characters and surrogates
+MSG = "Hello, World! £5 for ÿ, Ω and 日本語 \udc80\ud800 🐍 ok£"
+
+
+@pytest.mark.parametrize("key", ["KEY", "a£Z"])
+def test_stream_round_trip(key):
+    cb = CryptoBox(caesar.encoder, caesar.decoder)
+    cipher_msg = caesar.encrypt_stream(MSG, key)
+    assert cipher_msg == cb.encrypt(MSG, key)
+    assert caesar.decrypt_stream(cipher_msg, key) == MSG
+    assert cb.decrypt(cipher_msg, key) == MSG
+
+
+def test_stream_rejects_empty_key():
+    with pytest.raises(ValueError):
+        caesar.encrypt_stream("Hello World", "")
+    with pytest.raises(ValueError):
+        caesar.decrypt_stream("Hello World", "")
@@ -0,0 +1,37 @@
+#!/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2024 Flavio Calvo (UNIL / DCSR)
+# All rights reserved.
+
+"""
+Regression tests for custom (scalar) CryptoBox call-backs
+"""
+
+from scytale import CryptoBox
+
+
+def test_hexa_encoder_with_64bit_results():
+    def encoder(m, pos, key):
+        return (m * 0xDEADBEEFDEADBEEF) % 2**64
+
+    encoder.hexa = True
+
+    cb = CryptoBox(encoder, encoder)
+    assert cb.encrypt("Hello World") == "&NUUB swSbGL=====     "
+
+
+def test_double_count_encoder_with_negative_results():
+    def encoder(m, pos, key):
+        return m - 12345
+
+    def decoder(m, pos, key):
+        return m + 12345
+
+    encoder.hexa = True
+    encoder.double_count = True
+
+    cb = CryptoBox(encoder, decoder)
+    cypher = cb.encrypt("Hello World")
+    assert cypher == "Odilo C=====WBZ(A=====b!y££££££££     "
+    assert cb.decrypt(cypher) == "Hello World"
@@ -0,0 +1,28 @@
+#!/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2024 Flavio Calvo (UNIL / DCSR)
+# All rights reserved.
+
+"""
+Regression tests for the permutation cipher
+"""
+
+import pytest
+
+from scytale import CryptoBox, CryptoNumber, get_alphabet_permutation
+from scytale.cyphers import permutation
+
+# Alphabet letters mixed with "£", non latin-1 characters and surrogates
+MSG = "Hello, World! £5 for ÿ, Ω and 日本語 \udc80\ud800 🐍 ok£"
+
+
+@pytest.mark.parametrize(
+    "key", [None, get_alphabet_permutation("SECRET"), CryptoNumber("SECRET")]
+)
+def test_stream_round_trip(key):
+    cb = CryptoBox(permutation.encoder, permutation.decoder)
+    cipher_msg = permutation.encrypt_stream(MSG, key)
+    assert cipher_msg == cb.encrypt(MSG, key)
+    assert permutation.decrypt_stream(cipher_msg, key) == MSG
+    assert cb.decrypt(cipher_msg, key) == MSG
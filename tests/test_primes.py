@@ -0,0 +1,18 @@
+#!/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2024 Flavio Calvo (UNIL / DCSR)
+# All rights reserved.
+
+"""
+Regression tests for the prime number tools
+"""
+
+import numpy as np
+
+from scytale.tools.primes import isprime
+
+
+def test_isprime_number_types():
+    assert isprime(7) and isprime(np.int64(7)) and isprime(7.0)
+    assert not isprime(8.0) and not isprime(1.0)